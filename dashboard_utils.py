@@ -0,0 +1,205 @@
+# ============================================
+# DASHBOARD UTILS - CACHED STATIC OVERLAYS
+# ============================================
+
+import cv2
+import numpy as np
+from dataclasses import dataclass, field
+
+from zone_utils import draw_danger_zones
+
+# Cached static dashboard (built on first frame, per frame size)
+_static_cache = {}
+
+# Dashboard panel region (rows, cols) - static drawing stays inside it
+DASHBOARD_ROI = (slice(360, 711), slice(10, 401))
+
+# Cached solid color patches for blend_rect, keyed by (shape, color)
+_rect_cache = {}
+
+@dataclass
+class DrawCmd:
+    """Everything needed to draw one tracked person (no frame access)"""
+    track_id: str        # Deep SORT track ids are strings
+    bbox: tuple          # (x1, y1, x2, y2)
+    risk: int
+    status: str
+    trend: str
+    color: tuple         # BGR
+    zone_name: str
+    speed: float
+    posture: str
+    factors: dict = field(default_factory=dict)
+
+@dataclass
+class DashboardStats:
+    """Per-frame numbers shown on the dashboard and alert banner"""
+    frame_count: int
+    fps: float
+    people: int
+    alerts: int
+    runtime: int
+    critical_people: list = field(default_factory=list)  # [(id, score)]
+
+def build_static_dashboard(shape):
+    """
+    Render the parts of the dashboard that never change
+    (title + legend) into an image once
+
+    Args:
+        shape: frame shape (h, w, 3)
+
+    Returns:
+        (static_image, static_mask), cropped to DASHBOARD_ROI
+    """
+    static_image = np.zeros(shape, dtype=np.uint8)
+
+    # Dashboard title
+    cv2.putText(static_image, "📊 PHRIS DASHBOARD",
+               (20, 390),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
+
+    # Legend
+    cv2.rectangle(static_image, (10, 580), (80, 610), (0, 255, 0), 2)
+    cv2.putText(static_image, "SAFE", (15, 605), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+
+    cv2.rectangle(static_image, (90, 580), (180, 610), (0, 255, 255), 2)
+    cv2.putText(static_image, "WARNING", (100, 605), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+
+    cv2.rectangle(static_image, (190, 580), (270, 610), (0, 0, 255), 2)
+    cv2.putText(static_image, "CRITICAL", (200, 605), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+
+    # Keep only the dashboard panel, and only pixels that were drawn
+    static_image = static_image[DASHBOARD_ROI].copy()
+    static_mask = static_image.any(axis=2, keepdims=True)
+
+    return static_image, static_mask
+
+def draw_static_dashboard(frame):
+    """
+    Paste the cached title + legend onto the frame (no text rendering)
+
+    Args:
+        frame: video frame (modified in place)
+
+    Returns:
+        frame with static dashboard drawn
+    """
+    if frame.shape not in _static_cache:
+        _static_cache[frame.shape] = build_static_dashboard(frame.shape)
+
+    static_image, static_mask = _static_cache[frame.shape]
+    np.copyto(frame[DASHBOARD_ROI], static_image, where=static_mask)
+
+    return frame
+
+def blend_rect(frame, top_left, bottom_right, color, alpha):
+    """
+    Draw a semi-transparent filled rectangle, blending only its region
+    (no full-frame copy)
+
+    Args:
+        frame: video frame (modified in place)
+        top_left, bottom_right: rectangle corners (inclusive, like cv2.rectangle)
+        color: BGR fill color
+        alpha: opacity of the fill (0-1)
+
+    Returns:
+        frame with rectangle drawn
+    """
+    x1, y1 = top_left
+    x2, y2 = bottom_right
+    roi = frame[y1:y2 + 1, x1:x2 + 1]
+
+    key = (roi.shape, color)
+    if key not in _rect_cache:
+        _rect_cache[key] = np.full(roi.shape, color, dtype=np.uint8)
+
+    cv2.addWeighted(_rect_cache[key], alpha, roi, 1 - alpha, 0, dst=roi)
+
+    return frame
+
+def draw_person(frame, cmd):
+    """
+    Draw one person's box and 2 info lines
+
+    Args:
+        frame: video frame (modified in place)
+        cmd: DrawCmd for the person
+    """
+    x1, y1, x2, y2 = cmd.bbox
+    cv2.rectangle(frame, (x1, y1), (x2, y2), cmd.color, 3)
+
+    # Line 1 (above box): ID, risk, status, trend
+    info_text = f"ID:{cmd.track_id} RISK:{cmd.risk}/100 [{cmd.status}] {cmd.trend}"
+    cv2.putText(frame, info_text,
+               (x1, y1 - 10),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.6, cmd.color, 2)
+
+    # Line 2 (below box): zone, speed, posture + risk factors
+    factor_text = " ".join(f"{name}+{value}" for name, value in cmd.factors.items())
+    detail_text = f"{cmd.zone_name} | {cmd.speed:.1f} px/s | {cmd.posture} | {factor_text}"
+    cv2.putText(frame, detail_text,
+               (x1, y2 + 20),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+
+def draw_alert(frame, critical_people):
+    """Draw the red critical-risk banner"""
+    blend_rect(frame, (10, 10), (800, 120), (0, 0, 255), 0.6)
+
+    cv2.putText(frame, "🚨 CRITICAL RISK ALERT! 🚨",
+               (30, 50),
+               cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 255), 3)
+
+    alert_text = f"IMMEDIATE ACTION NEEDED FOR: "
+    for person_id, score in critical_people:
+        alert_text += f"Person {person_id} (Risk:{score}) "
+
+    cv2.putText(frame, alert_text,
+               (30, 100),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+
+def draw_dashboard(frame, stats):
+    """Draw the dashboard panel (background, title, legend, statistics)"""
+    # Semi-transparent background
+    blend_rect(frame, (10, 360), (400, 710), (0, 0, 0), 0.5)
+
+    # Title + legend (pre-rendered once)
+    draw_static_dashboard(frame)
+
+    # Statistics
+    lines = [
+        f"Frames: {stats.frame_count}",
+        f"FPS: {stats.fps:.1f}",
+        f"People: {stats.people}",
+        f"Alerts: {stats.alerts}",
+        f"Runtime: {stats.runtime}s"
+    ]
+    for i, text in enumerate(lines):
+        cv2.putText(frame, text,
+                   (20, 420 + 30 * i),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+
+def render_frame(frame, draw_cmds, stats):
+    """
+    Apply all cosmetic drawing for one frame (runs on the render thread)
+
+    Args:
+        frame: video frame (modified in place)
+        draw_cmds: list of DrawCmd, one per tracked person
+        stats: DashboardStats for this frame
+
+    Returns:
+        frame with everything drawn
+    """
+    draw_danger_zones(frame)
+
+    for cmd in draw_cmds:
+        draw_person(frame, cmd)
+
+    if stats.critical_people:
+        draw_alert(frame, stats.critical_people)
+
+    draw_dashboard(frame, stats)
+
+    return frame
@@ -5,28 +5,30 @@
 
 import cv2
 import time
+import queue
+import threading
+import traceback
 import winsound
 import numpy as np
-from ultralytics import YOLO
 
 # Import our custom modules
-from tracker_utils import track_people, get_person_center, calculate_speed
-from zone_utils import draw_danger_zones, is_person_in_danger_zone, get_zone_info
+from tracker_utils import track_people, predict_tracks, get_person_center, calculate_speed
+from zone_utils import get_zone_ids, ZONE_NAMES, ZONE_RISKS, SAFE
 from risk_engine import calculate_risk, cleanup_old_people
-from pose_utils import detect_pose, get_pose_risk
+from pose_utils import detect_pose, get_pose_risk, match_poses_to_tracks
+from model_utils import load_yolo, INFER_ARGS
+from dashboard_utils import DrawCmd, DashboardStats, render_frame
 
 print("=" * 70)
 print("🚀 PHRIS - Proactive Human Risk Intelligence System")
 print("=" * 70)
 print("\n📦 Loading AI models (first time takes ~30 seconds)...")
-print("   ├─ Loading YOLO person detector...")
-
-# Load YOLO models
-person_detector = YOLO("yolov8n.pt")  # Person detection
-print("   ├─ YOLO person detection... ✅")
 print("   ├─ Loading pose estimation model...")
-pose_detector = YOLO("yolov8n-pose.pt")  # Pose estimation
-print("   ├─ Pose estimation... ✅")
+
+# Load YOLO pose model (TensorRT / OpenVINO when available)
+# The pose model also reports person boxes, so one model does both jobs
+pose_detector = load_yolo("yolov8n-pose.pt")  # Person detection + pose
+print("   ├─ Person detection + pose estimation... ✅")
 
 print("\n📷 Opening camera...")
 cap = cv2.VideoCapture(0)
@@ -42,18 +44,80 @@ if not cap.isOpened():
     exit()
 
 print("   ├─ Camera opened... ✅")
+
+# ===== THREADED FRAME READER =====
+# Camera reads run on a background thread so USB decode overlaps with
+# YOLO inference. Detection/tracking stay on the main thread.
+read_q = queue.Queue(maxsize=2)
+stop_reading = threading.Event()
+
+def read_frames():
+    """Keep read_q filled with the newest (ret, frame) from the camera"""
+    while not stop_reading.is_set():
+        ret, frame = cap.read()
+        
+        # Drop the stale frame instead of letting latency build up
+        if read_q.full():
+            try:
+                read_q.get_nowait()
+            except queue.Empty:
+                pass
+        read_q.put((ret, frame))
+        
+        if not ret:
+            break
+
+reader_thread = threading.Thread(target=read_frames, daemon=True)
+reader_thread.start()
+
+# ===== THREADED RENDERER =====
+# All cosmetic drawing (zones, boxes, text, dashboard) runs on a second
+# thread so it overlaps with the next YOLO call. The main thread only
+# sends lightweight draw commands and shows finished frames.
+render_q = queue.Queue(maxsize=2)
+display_q = queue.Queue(maxsize=2)
+
+def render_frames():
+    """Draw overlays for each (frame, draw_cmds, stats) from render_q"""
+    while True:
+        item = render_q.get()
+        if item is None:  # Shutdown signal
+            break
+        
+        frame, draw_cmds, stats = item
+        try:
+            render_frame(frame, draw_cmds, stats)
+        except Exception:
+            # Log and keep rendering - a dead renderer would freeze the app
+            print("⚠️  Render error (frame shown without overlays):")
+            traceback.print_exc()
+        
+        # Keep only the newest finished frames
+        if display_q.full():
+            try:
+                display_q.get_nowait()
+            except queue.Empty:
+                pass
+        display_q.put(frame)
+
+render_thread = threading.Thread(target=render_frames, daemon=True)
+render_thread.start()
 print("\n🎬 Starting video stream... Press 'q' to quit")
 print("=" * 70)
 
+# ===== SETTINGS =====
+DETECT_EVERY_N = 2  # Run YOLO every N frames, Kalman-predict in between
+
 # ===== STATISTICS =====
 frame_count = 0
 total_alerts = 0
 start_time = time.time()
 last_alert_time = 0
+track_postures = {}  # {track_id: {"posture", "risk"}} from last detection
 
 # ===== MAIN LOOP =====
 while True:
-    ret, frame = cap.read()
+    ret, frame = read_q.get()
     
     if not ret:
         print("❌ Cannot read from camera")
@@ -62,39 +126,52 @@ while True:
     frame_count += 1
     current_time = time.time()
     
-    # === STEP 1: DETECT PEOPLE ===
-    person_results = person_detector(frame, conf=0.5)
-    detections = []
-    
-    for r in person_results:
-        for box in r.boxes:
-            cls = int(box.cls)
-            conf = float(box.conf)
+    if frame_count % DETECT_EVERY_N == 0:
+        # === STEP 1: DETECT PEOPLE + POSES (ONE YOLO PASS) ===
+        pose_results = pose_detector(frame, conf=0.5, **INFER_ARGS)
+        detections = []
+        
+        for r in pose_results:
+            # One device -> host copy per field, then filter with a mask
+            xyxy = r.boxes.xyxy.cpu().numpy().astype(np.int32)
+            cls = r.boxes.cls.cpu().numpy().astype(np.int32)
+            conf = r.boxes.conf.cpu().numpy()
             
-            if cls == 0 and conf > 0.5:  # Class 0 = person
-                x1, y1, x2, y2 = box.xyxy[0]
-                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-                detections.append([x1, y1, x2, y2, conf])
-    
-    # === STEP 2: TRACK PEOPLE (UNIQUE IDS) ===
-    tracks = track_people(detections, frame)
-    
-    # === STEP 3: DRAW DANGER ZONES ===
-    draw_danger_zones(frame)
-    
-    # === STEP 4: POSE DETECTION ===
-    poses = detect_pose(frame)
-    pose_risks = get_pose_risk(poses)
+            keep = (cls == 0) & (conf > 0.5)  # Class 0 = person
+            detections += [[*box, score]
+                           for box, score in zip(xyxy[keep].tolist(), conf[keep].tolist())]
+        
+        # === STEP 2: TRACK PEOPLE (UNIQUE IDS) ===
+        tracks = track_people(detections, frame)
+        
+        # === STEP 3: POSE ANALYSIS (REUSES STEP 1 RESULTS) ===
+        poses, pose_boxes = detect_pose(pose_results)
+        pose_risks = get_pose_risk(poses)
+        pose_matches = match_poses_to_tracks(tracks, pose_boxes)
+        track_postures = {track_id: pose_risks[pose_idx]
+                          for track_id, pose_idx in pose_matches.items()}
+    else:
+        # === STEP 1-3 (SKIPPED FRAME): TRACKER PREDICTION ONLY ===
+        # Postures are reused from the last detection frame
+        tracks = predict_tracks()
     
-    # === STEP 5: ANALYZE EACH PERSON ===
+    # === STEP 4: ANALYZE EACH PERSON ===
     critical_people = []
+    draw_cmds = []
+    
+    # Check every person against every zone in one vectorized call
+    centers = np.array([get_person_center(x1, y1, x2, y2)
+                        for _, x1, y1, x2, y2 in tracks], dtype=np.int32)
+    zone_ids = get_zone_ids(centers)
     
     for track_idx, (track_id, x1, y1, x2, y2) in enumerate(tracks):
         # Get person center
-        cx, cy = get_person_center(x1, y1, x2, y2)
+        cx, cy = centers[track_idx]
         
         # Check if in danger zone
-        in_danger, zone_name, zone_risk = is_person_in_danger_zone(cx, cy)
+        zone_id = int(zone_ids[track_idx])
+        in_danger = zone_id != SAFE
+        zone_risk = int(ZONE_RISKS[zone_id])
         
         # Calculate speed
         speed = calculate_speed(track_id, cx, cy, current_time)
@@ -102,16 +179,16 @@ while True:
         # Get posture information
         posture = "STANDING"
         posture_risk = 0
-        if track_idx in pose_risks:
-            posture = pose_risks[track_idx]["posture"]
-            posture_risk = pose_risks[track_idx]["risk"]
+        if track_id in track_postures:
+            posture = track_postures[track_id]["posture"]
+            posture_risk = track_postures[track_id]["risk"]
         
-        # === STEP 6: CALCULATE RISK ===
+        # === STEP 5: CALCULATE RISK ===
         risk_info = calculate_risk(
             person_id=track_id,
             cx=cx, cy=cy,
             in_danger_zone=in_danger,
-            zone_name=zone_name,
+            zone_id=zone_id,
             zone_risk=zone_risk,
             speed=speed,
             posture=posture,
@@ -119,54 +196,22 @@ while True:
         )
         
         risk_score = risk_info["score"]
-        factors = risk_info["factors"]
-        trend = risk_info["trend"]
-        status = risk_info["status"]
-        color = risk_info["color"]
-        
-        # === STEP 7: DRAW PERSON BOX ===
-        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 3)
-        
-        # Main info line
-        info_text = f"ID:{track_id} RISK:{risk_score}/100 [{status}]"
-        cv2.putText(frame, info_text,
-                   (x1, y1 - 35),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-        
-        # Trend line
-        trend_text = f"Trend: {trend}"
-        cv2.putText(frame, trend_text,
-                   (x1, y1 - 10),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
-        
-        # Zone info
-        zone_text = f"Zone: {zone_name}"
-        cv2.putText(frame, zone_text,
-                   (x1, y2 + 20),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-        
-        # Speed info
-        speed_text = f"Speed: {speed:.1f} px/s"
-        cv2.putText(frame, speed_text,
-                   (x1, y2 + 40),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
         
-        # Posture info
-        posture_text = f"Posture: {posture}"
-        cv2.putText(frame, posture_text,
-                   (x1, y2 + 60),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-        
-        # Risk factors breakdown
-        y_offset = y2 + 80
-        for factor_name, factor_value in factors.items():
-            factor_text = f"├─ {factor_name}: +{factor_value}"
-            cv2.putText(frame, factor_text,
-                       (x1, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-            y_offset += 18
+        # === STEP 6: QUEUE PERSON DRAWING (RENDER THREAD) ===
+        draw_cmds.append(DrawCmd(
+            track_id=track_id,
+            bbox=(x1, y1, x2, y2),
+            risk=risk_score,
+            status=risk_info["status"],
+            trend=risk_info["trend"],
+            color=risk_info["color"],
+            zone_name=ZONE_NAMES[zone_id],
+            speed=speed,
+            posture=posture,
+            factors=risk_info["factors"]
+        ))
         
-        # === STEP 8: CRITICAL ALERT ===
+        # === STEP 7: CRITICAL ALERT ===
         if risk_score > 70:
             critical_people.append((track_id, risk_score))
     
@@ -176,77 +221,38 @@ while True:
             total_alerts += 1
             last_alert_time = current_time
             
-            # Sound alert
+            # Sound alert (async - Beep would block the loop for 200 ms)
             try:
-                winsound.Beep(1000, 200)
+                winsound.PlaySound("SystemAsterisk",
+                                   winsound.SND_ALIAS | winsound.SND_ASYNC)
             except:
                 pass
-        
-        # Red overlay alert
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, 10), (800, 120), (0, 0, 255), -1)
-        cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
-        
-        cv2.putText(frame, "🚨 CRITICAL RISK ALERT! 🚨",
-                   (30, 50),
-                   cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 255), 3)
-        
-        alert_text = f"IMMEDIATE ACTION NEEDED FOR: "
-        for person_id, score in critical_people:
-            alert_text += f"Person {person_id} (Risk:{score}) "
-        
-        cv2.putText(frame, alert_text,
-                   (30, 100),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-    
-    # === DRAW DASHBOARD ===
-    # Semi-transparent background
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (10, 360), (400, 710), (0, 0, 0), -1)
-    cv2.addWeighted(overlay, 0.5, frame, 0.5, 0, frame)
-    
-    # Dashboard title
-    cv2.putText(frame, "📊 PHRIS DASHBOARD",
-               (20, 390),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
     
-    # Statistics
+    # === HAND FRAME TO RENDER THREAD ===
     elapsed_time = current_time - start_time
     fps = frame_count / elapsed_time if elapsed_time > 0 else 0
     
-    cv2.putText(frame, f"Frames: {frame_count}",
-               (20, 420),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-    
-    cv2.putText(frame, f"FPS: {fps:.1f}",
-               (20, 450),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-    
-    cv2.putText(frame, f"People: {len(tracks)}",
-               (20, 480),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-    
-    cv2.putText(frame, f"Alerts: {total_alerts}",
-               (20, 510),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+    stats = DashboardStats(
+        frame_count=frame_count,
+        fps=fps,
+        people=len(tracks),
+        alerts=total_alerts,
+        runtime=int(elapsed_time),
+        critical_people=critical_people
+    )
+    try:
+        render_q.put((frame, draw_cmds, stats), timeout=1)
+    except queue.Full:
+        if not render_thread.is_alive():
+            print("❌ Render thread stopped - shutting down")
+            break
     
-    runtime = int(elapsed_time)
-    cv2.putText(frame, f"Runtime: {runtime}s",
-               (20, 540),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-    
-    # Legend
-    cv2.rectangle(frame, (10, 580), (80, 610), (0, 255, 0), 2)
-    cv2.putText(frame, "SAFE", (15, 605), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-    
-    cv2.rectangle(frame, (90, 580), (180, 610), (0, 255, 255), 2)
-    cv2.putText(frame, "WARNING", (100, 605), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
-    
-    cv2.rectangle(frame, (190, 580), (270, 610), (0, 0, 255), 2)
-    cv2.putText(frame, "CRITICAL", (200, 605), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-    
-    # === DISPLAY FRAME ===
-    cv2.imshow("PHRIS - Proactive Human Risk Intelligence System", frame)
+    # === DISPLAY LATEST RENDERED FRAME ===
+    try:
+        cv2.imshow("PHRIS - Proactive Human Risk Intelligence System",
+                   display_q.get_nowait())
+    except queue.Empty:
+        pass
     
     # === QUIT ON 'Q' ===
     if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -264,6 +270,18 @@ while True:
         cleanup_old_people()
 
 # Cleanup
+try:
+    render_q.put(None, timeout=1)
+except queue.Full:
+    pass  # Renderer already gone (daemon thread, nothing to wait for)
+
+# Stop the reader before releasing the camera it is reading from
+stop_reading.set()
+try:
+    read_q.get_nowait()  # Unblock a pending put() on a full queue
+except queue.Empty:
+    pass
+reader_thread.join()
 cap.release()
 cv2.destroyAllWindows()
 print("✅ PHRIS closed successfully")
@@ -0,0 +1,119 @@
+# ============================================
+# MODEL UTILS - LOAD OPTIMIZED YOLO MODELS
+# ============================================
+
+import os
+import json
+import importlib.util
+import importlib.metadata
+import numpy as np
+import torch
+from ultralytics import YOLO
+
+# Inference settings shared by every YOLO call
+# FP16 on CUDA (Tensor Cores), FP32 on CPU
+DEVICE = 0 if torch.cuda.is_available() else "cpu"
+IMGSZ = 640  # Letterboxed model input (camera frames stay 1280x720)
+INFER_ARGS = {
+    "imgsz": IMGSZ,
+    "device": DEVICE,
+    "half": DEVICE != "cpu",
+    "verbose": False   # No per-frame console logging
+}
+
+# Allow TF32 for any matmuls that still run in FP32
+torch.set_float32_matmul_precision("high")
+
+def _backend_versions(packages):
+    """Installed versions of the export backends (None if not installed)"""
+    versions = {}
+    for name in packages:
+        try:
+            versions[name] = importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+def _warmup(model):
+    """
+    Run one dummy frame through the model
+    (.engine / OpenVINO backends only load on the first predict,
+    so a stale or incompatible export fails here, not in the main loop)
+    """
+    model(np.zeros((IMGSZ, IMGSZ, 3), dtype=np.uint8), **INFER_ARGS)
+    return model
+
+def load_yolo(weights):
+    """
+    Load a YOLO model using the fastest runtime available
+
+    On NVIDIA GPUs the .pt weights are exported once to a TensorRT
+    FP16 engine (cached next to the weights) and the engine is loaded.
+    On CPU-only machines an OpenVINO export is used instead.
+    Export is only attempted when its backend is already installed
+    (we never let ultralytics pip-install it at startup). A failed export
+    leaves a ".failed" marker with the error and backend versions; the
+    export is retried once those versions change (or the marker is deleted).
+    Every optimized model gets a warmup frame, and anything that fails
+    falls back to the plain .pt weights.
+
+    Args:
+        weights: path to .pt weights (e.g. "yolov8n-pose.pt")
+
+    Returns:
+        YOLO model (call it exactly like the .pt model)
+    """
+    base = os.path.splitext(weights)[0]
+
+    if torch.cuda.is_available():
+        exported = base + ".engine"
+        backends = ["tensorrt", "onnx"]
+        export_args = {"format": "engine", "half": True, "imgsz": IMGSZ, "device": 0}
+    else:
+        exported = base + "_openvino_model"
+        backends = ["openvino"]
+        export_args = {"format": "openvino", "imgsz": IMGSZ}
+
+    failed_marker = exported + ".failed"
+
+    # Cached export: verify it actually runs on this machine
+    if os.path.exists(exported):
+        try:
+            return _warmup(YOLO(exported))
+        except Exception as e:
+            print(f"   ├─ Cached {exported} does not load ({type(e).__name__}: {e})")
+            print(f"   ├─ Delete {exported} to re-export, using {weights}")
+            return YOLO(weights)
+
+    missing = [name for name in backends if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"   ├─ {', '.join(missing)} not installed, using {weights}")
+        return YOLO(weights)
+
+    versions = _backend_versions(backends + ["ultralytics"])
+
+    if os.path.exists(failed_marker):
+        try:
+            with open(failed_marker) as f:
+                failure = json.load(f)
+        except (OSError, ValueError):
+            failure = {}
+
+        if failure.get("versions") == versions:
+            print(f"   ├─ Previous export failed ({failure.get('error', 'unknown error')})")
+            print(f"   ├─ Delete {failed_marker} to retry, using {weights}")
+            return YOLO(weights)
+
+        # Backend versions changed since the failure - try again
+        os.remove(failed_marker)
+
+    try:
+        # One-time export (takes a few minutes for TensorRT)
+        exported = YOLO(weights).export(**export_args)
+        return _warmup(YOLO(exported))
+    except Exception as e:
+        print(f"   ├─ Optimized export failed ({type(e).__name__}: {e})")
+        print(f"   ├─ Wrote {failed_marker} (delete it to retry), using {weights}")
+        with open(failed_marker, "w") as f:
+            json.dump({"error": f"{type(e).__name__}: {e}", "versions": versions}, f)
+        return YOLO(weights)
@@ -2,32 +2,81 @@
 # POSE UTILS - DETECT BODY POSITION
 # ============================================
 
-from ultralytics import YOLO
 import numpy as np
+import torch
 
-# Load pose model (detects 17 body joints)
-pose_model = YOLO("yolov8n-pose.pt")
+# NOTE: no model is loaded here - main.py owns the single pose model
+# and passes its results into detect_pose()
 
-def detect_pose(frame):
-    """
-    Detect body pose (skeleton with joints)
-    
-    Returns: poses array with 17 keypoints per person
+# Posture lookup table: code -> (posture_type, risk_score)
+POSTURES = [
+    ("UNKNOWN", 0),
+    ("STANDING", 0),
+    ("BENDING", 25),    # Risky near machinery
+    ("LYING", 50),      # Very risky
+    ("KNEELING", 15)    # Somewhat risky
+]
+UNKNOWN, STANDING, BENDING, LYING, KNEELING = range(len(POSTURES))
+
+def detect_pose(results):
     """
-    results = pose_model(frame, conf=0.5)
+    Extract body poses (skeleton with joints) from YOLO pose results
     
-    if len(results) == 0:
-        return []
+    Args:
+        results: output of pose_detector(frame) from main.py
     
+    Returns: (poses, boxes)
+        poses: (P, 17, 2) keypoints tensor, left on the model's device
+        boxes: (P, 4) array of [x1, y1, x2, y2] (same order as poses)
+    """
     poses = []
+    boxes = [np.zeros((0, 4), dtype=np.float32)]
+    
     for result in results:
         if result.keypoints is None:
             continue
         
-        keypoints = result.keypoints.xy  # Get keypoints
-        poses.append(keypoints)
+        poses.append(result.keypoints.xy)
+        boxes.append(result.boxes.xyxy.cpu().numpy())
     
-    return poses
+    if not poses:
+        return torch.zeros((0, 17, 2)), np.concatenate(boxes)
+    
+    return torch.cat(poses), np.concatenate(boxes)
+
+
+def classify_postures(poses):
+    """
+    Classify the posture of every person at once (runs on the
+    keypoints' device - GPU when available)
+    
+    Keypoints (YOLO pose layout):
+    0=nose, 5=left_shoulder, 6=right_shoulder
+    11=left_hip, 12=right_hip, 15=left_ankle, 16=right_ankle
+    
+    Args:
+        poses: (P, 17, 2) keypoints tensor or array
+    
+    Returns: list of (posture_type, risk_score), one per person
+    """
+    poses = torch.as_tensor(poses, dtype=torch.float32).reshape(-1, 17, 2)
+    
+    # Distances for all people at once
+    shoulder_to_hip_dist = torch.linalg.norm(poses[:, 5] - poses[:, 11], dim=1)
+    hip_to_ankle_dist = torch.linalg.norm(poses[:, 11] - poses[:, 15], dim=1)
+    
+    # Undetected joints come back as (0, 0)
+    missing = ~(poses[:, [5, 11, 15]] != 0).any(dim=2).all(dim=1)
+    
+    # Apply rules from lowest to highest priority so later ones win
+    codes = torch.full((len(poses),), STANDING, dtype=torch.int8, device=poses.device)
+    codes[(shoulder_to_hip_dist > 100) & (hip_to_ankle_dist < 40)] = KNEELING
+    codes[hip_to_ankle_dist < 30] = LYING
+    codes[shoulder_to_hip_dist < 40] = BENDING
+    codes[missing] = UNKNOWN
+    
+    # Single device -> host copy for the whole frame
+    return [POSTURES[code] for code in codes.cpu().numpy()]
 
 
 def analyze_posture(keypoints):
@@ -45,49 +94,7 @@ def analyze_posture(keypoints):
     if keypoints is None or len(keypoints) < 17:
         return "UNKNOWN", 0
     
-    # Extract key joints (index numbers from YOLO pose)
-    # 0=nose, 5=left_shoulder, 6=right_shoulder
-    # 11=left_hip, 12=right_hip, 15=left_ankle, 16=right_ankle
-    
-    try:
-        # Shoulder positions
-        left_shoulder = keypoints   # [x, y]
-        right_shoulder = keypoints
-        
-        # Hip positions  
-        left_hip = keypoints
-        right_hip = keypoints
-        
-        # Ankle positions
-        left_ankle = keypoints
-        right_ankle = keypoints
-        
-        # If keypoints not detected (confidence = 0)
-        if (left_shoulder == 0 or left_hip == 0):
-            return "UNKNOWN", 0
-        
-        # Calculate body angles
-        shoulder_to_hip_dist = abs(left_shoulder - left_hip)
-        hip_to_ankle_dist = abs(left_hip - left_ankle)
-        
-        # If person bending (shoulder-to-hip distance small)
-        if shoulder_to_hip_dist < 40:
-            return "BENDING", 25  # Risky near machinery
-        
-        # If person lying down (hip-to-ankle distance small)
-        elif hip_to_ankle_dist < 30:
-            return "LYING", 50  # Very risky
-        
-        # If person kneeling
-        elif shoulder_to_hip_dist > 100 and hip_to_ankle_dist < 40:
-            return "KNEELING", 15  # Somewhat risky
-        
-        # Normal standing
-        else:
-            return "STANDING", 0
-    
-    except:
-        return "UNKNOWN", 0
+    return classify_postures(torch.as_tensor(keypoints)[None, :17])[0]
 
 
 def get_pose_risk(poses):
@@ -98,8 +105,41 @@ def get_pose_risk(poses):
     """
     pose_risks = {}
     
-    for idx, keypoints in enumerate(poses):
-        posture, risk = analyze_posture(keypoints)
+    for idx, (posture, risk) in enumerate(classify_postures(poses)):
         pose_risks[idx] = {"posture": posture, "risk": risk}
     
     return pose_risks
+
+
+def match_poses_to_tracks(tracks, pose_boxes, min_iou=0.3):
+    """
+    Match each tracked person to the pose whose box overlaps it most
+    
+    Args:
+        tracks: list of (track_id, x1, y1, x2, y2)
+        pose_boxes: (P, 4) array of [x1, y1, x2, y2] from detect_pose
+        min_iou: minimum overlap to accept a match
+    
+    Returns: dictionary of {track_id: pose_index}
+    """
+    if not tracks or len(pose_boxes) == 0:
+        return {}
+    
+    track_boxes = np.array([t[1:] for t in tracks], dtype=np.float32)
+    pose_boxes = np.array(pose_boxes, dtype=np.float32)
+    
+    # IoU matrix (tracks x poses)
+    tl = np.maximum(track_boxes[:, None, :2], pose_boxes[None, :, :2])
+    br = np.minimum(track_boxes[:, None, 2:], pose_boxes[None, :, 2:])
+    inter = np.clip(br - tl, 0, None).prod(axis=2)
+    area_t = (track_boxes[:, 2:] - track_boxes[:, :2]).prod(axis=1)
+    area_p = (pose_boxes[:, 2:] - pose_boxes[:, :2]).prod(axis=1)
+    iou = inter / (area_t[:, None] + area_p[None, :] - inter + 1e-6)
+    
+    matches = {}
+    best = iou.argmax(axis=1)
+    for row, (track_id, *_) in enumerate(tracks):
+        if iou[row, best[row]] >= min_iou:
+            matches[track_id] = int(best[row])
+    
+    return matches
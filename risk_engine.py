@@ -2,75 +2,74 @@
 # RISK ENGINE - CALCULATE DANGER LEVEL (FIXED)
 # ============================================
 
-from collections import deque
+from collections import OrderedDict
 import time
+import numpy as np
+from numba import njit
 
 # Store person profiles (track their history)
-person_profiles = {}
+# Ordered least -> most recently updated, so old people sit at the front
+person_profiles = OrderedDict()
+
+# History ring buffer layout (one row per frame)
+HISTORY_LEN = 100  # Last 100 frames
+COL_TIME, COL_CX, COL_CY, COL_SPEED, COL_RISK, COL_ZONE = range(6)
 
 class PersonProfile:
     """Store information about a tracked person"""
     def __init__(self, person_id):
         self.person_id = person_id
-        self.times = deque(maxlen=100)  # Last 100 timestamps
-        self.positions = deque(maxlen=100)  # Last 100 positions
-        self.zones = deque(maxlen=100)  # Last 100 zones
-        self.speeds = deque(maxlen=100)  # Last 100 speeds
-        self.risk_scores = deque(maxlen=100)  # Last 100 risk scores
+        # Columns: time, cx, cy, speed, risk, zone_id
+        # (float64 so epoch timestamps keep sub-second precision)
+        self.history = np.zeros((HISTORY_LEN, 6), dtype=np.float64)
+        self.head = 0  # Total rows ever written
         self.first_danger_time = None  # When person entered danger
         self.last_update = time.time()
 
+    def __len__(self):
+        """Number of valid rows in the history"""
+        return min(self.head, HISTORY_LEN)
+
+    def append(self, row):
+        """Write one history row, overwriting the oldest when full"""
+        self.history[self.head % HISTORY_LEN] = row
+        self.head += 1
+
+    def recent(self, column, n):
+        """Last n values of a column, oldest first"""
+        rows = np.arange(self.head - n, self.head) % HISTORY_LEN
+        return self.history[rows, column]
+
 def get_profile(person_id):
-    """Get or create person profile"""
+    """Get or create person profile (marks it as most recently used)"""
     if person_id not in person_profiles:
         person_profiles[person_id] = PersonProfile(person_id)
+    person_profiles.move_to_end(person_id)
     return person_profiles[person_id]
 
-def calculate_risk(person_id, cx, cy, in_danger_zone, zone_name, zone_risk, 
-                   speed, posture, posture_risk):
+@njit(cache=True, fastmath=True)
+def _score(in_danger, zone_risk, time_in_zone, speed, prev_speed,
+           posture_risk, cx):
     """
-    Calculate overall risk score for a person (0-100)
-    
-    Args:
-        person_id: unique person identifier
-        cx, cy: center position
-        in_danger_zone: boolean, is person in danger zone?
-        zone_name: name of zone
-        zone_risk: base risk from zone (0-50)
-        speed: speed in pixels/second
-        posture: body posture (STANDING, BENDING, LYING, KNEELING)
-        posture_risk: risk from posture (0-50)
+    Pure arithmetic core of the risk score (JIT-compiled)
     
     Returns:
-        risk_info: dict with score, factors, trend, status, color
+        (total, zone, time, speed, posture, proximity, acceleration)
     """
-    
-    profile = get_profile(person_id)
-    profile.last_update = time.time()
-    
     # === FACTOR 1: ZONE RISK (0-40) ===
     factor_zone = 0
-    if in_danger_zone:
+    if in_danger:
         factor_zone = zone_risk  # 30-40 points
     
     # === FACTOR 2: TIME IN ZONE (0-20) ===
     factor_time = 0
-    if in_danger_zone:
-        if profile.first_danger_time is None:
-            profile.first_danger_time = time.time()
-        
-        time_in_zone = time.time() - profile.first_danger_time
-        
+    if in_danger:
         if time_in_zone > 5:      # More than 5 seconds
             factor_time = 20
         elif time_in_zone > 3:    # More than 3 seconds
             factor_time = 15
         elif time_in_zone > 1:    # More than 1 second
             factor_time = 10
-    else:
-        # Reset timer when leaving zone
-        profile.first_danger_time = None
-        factor_time = 0
     
     # === FACTOR 3: SPEED (0-20) ===
     factor_speed = 0
@@ -89,24 +88,18 @@ def calculate_risk(person_id, cx, cy, in_danger_zone, zone_name, zone_risk,
     # === FACTOR 5: PROXIMITY RISK (0-10) ===
     # (Can add proximity to machinery detection here)
     factor_proximity = 0
-    if in_danger_zone and cx < 100:  # Very close to left edge
+    if in_danger and cx < 100:  # Very close to left edge
         factor_proximity = 10
-    elif in_danger_zone and cx > 1180:  # Very close to right edge
+    elif in_danger and cx > 1180:  # Very close to right edge
         factor_proximity = 10
     
     # === FACTOR 6: ACCELERATION (0-10) ===
     factor_acceleration = 0
-    if len(profile.speeds) >= 2:
-        prev_speed = list(profile.speeds)[-2]
-        curr_speed = speed
-        acceleration = curr_speed - prev_speed
-        
-        if acceleration > 50:    # Sudden speed increase
-            factor_acceleration = 10
-        elif acceleration > 25:
-            factor_acceleration = 5
-    
-    profile.speeds.append(speed)
+    acceleration = speed - prev_speed
+    if acceleration > 50:    # Sudden speed increase
+        factor_acceleration = 10
+    elif acceleration > 25:
+        factor_acceleration = 5
     
     # === CALCULATE TOTAL RISK ===
     total_risk = (factor_zone + factor_time + factor_speed + 
@@ -115,16 +108,63 @@ def calculate_risk(person_id, cx, cy, in_danger_zone, zone_name, zone_risk,
     # Cap at 100
     total_risk = min(100, total_risk)
     
+    return (total_risk, factor_zone, factor_time, factor_speed,
+            factor_posture, factor_proximity, factor_acceleration)
+
+# Compile _score at import (during model loading), not on the first frame
+# with a person - argument types match the calls in calculate_risk
+_score(False, 0, 0.0, 0.0, 0.0, 0, 0)
+
+def calculate_risk(person_id, cx, cy, in_danger_zone, zone_id, zone_risk, 
+                   speed, posture, posture_risk):
+    """
+    Calculate overall risk score for a person (0-100)
+    
+    Args:
+        person_id: unique person identifier
+        cx, cy: center position
+        in_danger_zone: boolean, is person in danger zone?
+        zone_id: zone id (int, see zone_utils.ZONE_NAMES)
+        zone_risk: base risk from zone (0-50)
+        speed: speed in pixels/second
+        posture: body posture (STANDING, BENDING, LYING, KNEELING)
+        posture_risk: risk from posture (0-50)
+    
+    Returns:
+        risk_info: dict with score, factors, trend, status, color
+    """
+    
+    profile = get_profile(person_id)
+    profile.last_update = time.time()
+    
+    # === TIME IN ZONE (bookkeeping stays in Python) ===
+    time_in_zone = 0.0
+    if in_danger_zone:
+        if profile.first_danger_time is None:
+            profile.first_danger_time = time.time()
+        
+        time_in_zone = time.time() - profile.first_danger_time
+    else:
+        # Reset timer when leaving zone
+        profile.first_danger_time = None
+    
+    # Speed from two frames back (same speed = no acceleration)
+    prev_speed = float(speed)
+    if len(profile) >= 2:
+        prev_speed = float(profile.recent(COL_SPEED, 2)[0])
+    
+    (total_risk, factor_zone, factor_time, factor_speed, factor_posture,
+     factor_proximity, factor_acceleration) = _score(
+        bool(in_danger_zone), int(zone_risk), float(time_in_zone),
+        float(speed), prev_speed, int(posture_risk), int(cx))
+    
     # Store in history
-    profile.risk_scores.append(total_risk)
-    profile.zones.append(zone_name)
-    profile.times.append(time.time())
-    profile.positions.append((cx, cy))
+    profile.append((time.time(), cx, cy, speed, total_risk, zone_id))
     
     # === DETERMINE TREND ===
     trend = "STABLE"
-    if len(profile.risk_scores) >= 3:
-        recent_scores = list(profile.risk_scores)[-3:]
+    if len(profile) >= 3:
+        recent_scores = profile.recent(COL_RISK, 3)
         if recent_scores[-1] > recent_scores[0] + 10:
             trend = "↑ INCREASING"
         elif recent_scores[-1] < recent_scores[0] - 10:
@@ -164,7 +204,7 @@ def calculate_risk(person_id, cx, cy, in_danger_zone, zone_name, zone_risk,
         "trend": trend,
         "status": status,
         "color": color,
-        "zone": zone_name
+        "zone": zone_id
     }
 
 def cleanup_old_people(max_age=60):
@@ -172,15 +212,15 @@ def cleanup_old_people(max_age=60):
     Remove people who haven't been seen for max_age seconds
     Prevents memory leak from tracking ghost people
     """
-    global person_profiles
     current_time = time.time()
     
-    to_delete = []
-    for person_id, profile in person_profiles.items():
-        if current_time - profile.last_update > max_age:
-            to_delete.append(person_id)
-    
-    for person_id in to_delete:
-        del person_profiles[person_id]
+    # Oldest profiles are at the front - stop at the first recent one
+    removed = 0
+    while person_profiles:
+        person_id, profile = next(iter(person_profiles.items()))
+        if current_time - profile.last_update <= max_age:
+            break
+        person_profiles.popitem(last=False)
+        removed += 1
     
-    return len(to_delete)
\ No newline at end of file
+    return removed
\ No newline at end of file
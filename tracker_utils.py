@@ -2,18 +2,33 @@
 # TRACKER UTILS - TRACK UNIQUE PEOPLE
 # ============================================
 
-from deep_sort_realtime.deepsort_tracker import DeepSort
-import numpy as np
+from collections import deque
+from functools import lru_cache
+import math
 
-# Create global tracker
-tracker = DeepSort(
-    max_age=30,  # Remember person for 30 frames if missing
-    n_init=3     # Need 3 confirmed detections to add person
-)
+@lru_cache(maxsize=None)
+def _get_tracker():
+    """
+    Create the global tracker on first use (not at import time),
+    so its re-ID model only loads when the first frame arrives
+    """
+    import torch
+    from deep_sort_realtime.deepsort_tracker import DeepSort
+    
+    return DeepSort(
+        max_age=30,  # Remember person for 30 frames if missing
+        n_init=3,    # Need 3 confirmed detections to add person
+        embedder="mobilenet",                       # Re-ID feature extractor
+        embedder_gpu=torch.cuda.is_available(),     # Run it on the GPU if present
+        half=True                                   # FP16 embedder on GPU
+    )
 
 # Store position history for speed calculation
 position_history = {}
 
+# Kalman-only predict steps since the last detection update
+predict_steps = 0
+
 def track_people(detections, frame):
     """
     Track each person with UNIQUE ID
@@ -26,9 +41,6 @@ def track_people(detections, frame):
         list of (track_id, x1, y1, x2, y2)
     """
     
-    if not detections:
-        return []
-    
     # Format detections for Deep SORT
     # Need: [left, top, width, height] format
     formatted = []
@@ -40,13 +52,54 @@ def track_people(detections, frame):
         formatted.append((bbox, conf, 'person'))
     
     # Update tracker with detections
-    tracks = tracker.update_tracks(formatted, frame=frame)
+    # (always, even when empty, so missed tracks age out and get deleted)
+    global predict_steps
+    tracks = _get_tracker().update_tracks(formatted, frame=frame)
+    predict_steps = 0
+    
+    if not detections:
+        return []
+    
+    # Same rule as predict_tracks: only people matched at this update
+    # (missed tracks stay alive in Deep SORT but are not drawn or scored)
+    return confirmed_tracks(tracks, max_missed=0)
+
+
+def predict_tracks():
+    """
+    Move existing tracks forward with the Kalman filter only
+    (used on frames where YOLO detection is skipped)
     
+    Returns:
+        list of (track_id, x1, y1, x2, y2)
+    """
+    global predict_steps
+    tracker = _get_tracker().tracker
+    tracker.predict()
+    predict_steps += 1
+    
+    # Only people matched at the last detection frame - a track that was
+    # already missed there must not keep sliding along its velocity
+    return confirmed_tracks(tracker.tracks, max_missed=predict_steps)
+
+
+def confirmed_tracks(tracks, max_missed=None):
+    """
+    Convert Deep SORT tracks to (track_id, x1, y1, x2, y2) tuples
+    
+    Args:
+        tracks: Deep SORT tracks
+        max_missed: skip tracks not updated for more than this many
+                    predict steps (None = keep all confirmed tracks)
+    """
     results = []
     for t in tracks:
         if not t.is_confirmed():  # Ignore unconfirmed tracks
             continue
         
+        if max_missed is not None and t.time_since_update > max_missed:
+            continue
+        
         track_id = t.track_id  # UNIQUE ID for this person
         x1, y1, x2, y2 = map(int, t.to_ltrb())
         results.append((track_id, x1, y1, x2, y2))
@@ -78,22 +131,17 @@ def calculate_speed(person_id, cx, cy, current_time):
     
     if person_id not in position_history:
         position_history[person_id] = {
-            'positions': [],
-            'times': [],
+            'positions': deque(maxlen=2),  # Only last 2 needed for speed
+            'times': deque(maxlen=2),
             'speed': 0
         }
     
     hist = position_history[person_id]
     
-    # Add current position
+    # Add current position (oldest drops off automatically)
     hist['positions'].append((cx, cy))
     hist['times'].append(current_time)
     
-    # Keep only last 10 positions
-    if len(hist['positions']) > 10:
-        hist['positions'].pop(0)
-        hist['times'].pop(0)
-    
     speed = 0
     
     # Calculate speed from last 2 positions
@@ -102,7 +150,7 @@ def calculate_speed(person_id, cx, cy, current_time):
         curr_x, curr_y = hist['positions'][-1]
         
         # Distance in pixels
-        distance = np.sqrt((curr_x - prev_x)**2 + (curr_y - prev_y)**2)
+        distance = math.hypot(curr_x - prev_x, curr_y - prev_y)
         
         # Time in seconds
         time_diff = hist['times'][-1] - hist['times'][-2]
@@ -4,13 +4,28 @@
 
 import cv2
 import numpy as np
+from matplotlib.path import Path
 
 # DEFINE YOUR DANGER ZONES
 # Each zone is a polygon (list of corner points)
 # FORMAT: [[x1, y1], [x2, y2], [x3, y3], [x4, y4]]
 
-DANGER_ZONES = {
-    "HEAVY_MACHINERY": {
+# Zone ids are list indexes - stored as small ints (uint8), not strings
+ZONE_NAMES = ["SAFE", "HEAVY_MACHINERY", "ELECTRICAL", "CHEMICAL"]
+SAFE, HEAVY_MACHINERY, ELECTRICAL, CHEMICAL = range(len(ZONE_NAMES))
+
+DANGER_ZONES = [
+    # SAFE - outside every danger zone (no polygon)
+    {
+        "coords": None,
+        "color": (0, 255, 0),      # Green
+        "risk": 0,
+        "name": "SAFE AREA",
+        "description": "Outside all danger zones"
+    },
+
+    # HEAVY_MACHINERY
+    {
         "coords": np.array([[300, 200], [900, 200], [900, 600], [300, 600]]),
         "color": (0, 0, 255),      # Red in BGR format
         "risk": 40,                # Base risk if person enters
@@ -18,7 +33,8 @@ DANGER_ZONES = {
         "description": "Industrial machinery - highest danger"
     },
 
-    "ELECTRICAL": {
+    # ELECTRICAL
+    {
         "coords": np.array([[500, 150], [700, 150], [700, 400], [500, 400]]),
         "color": (0, 165, 255),    # Orange
         "risk": 35,
@@ -26,14 +42,18 @@ DANGER_ZONES = {
         "description": "High voltage equipment"
     },
 
-    "CHEMICAL": {
+    # CHEMICAL
+    {
         "coords": np.array([[100, 100], [250, 100], [250, 300], [100, 300]]),
         "color": (0, 255, 255),    # Yellow
         "risk": 30,
         "name": "CHEMICAL STORAGE",
         "description": "Hazardous materials area"
     }
-}
+]
+
+# Base risk per zone id (lookup table)
+ZONE_RISKS = np.array([zone["risk"] for zone in DANGER_ZONES], dtype=np.uint8)
 
 # Safe areas (for reference)
 SAFE_ZONES = {
@@ -46,34 +66,40 @@ SAFE_ZONES = {
     }
 }
 
-def draw_danger_zones(frame):
+# Precomputed polygon paths for fast point-in-zone checks
+# (mask column i = zone id i + 1, since SAFE has no polygon)
+ZONE_PATHS = [Path(zone["coords"]) for zone in DANGER_ZONES[SAFE + 1:]]
+
+# Cached zone overlays (built on first frame, per frame size)
+_zone_overlay_cache = {}
+
+def build_zone_overlay(shape):
     """
-    Draw all danger zones on the frame (visual feedback)
+    Render all danger zones once (zones are static)
 
     Args:
-        frame: video frame (numpy array)
+        shape: frame shape (h, w, 3)
 
     Returns:
-        frame with zones drawn
+        (roi, fill_image, fill_mask, line_image, line_mask, blend_buffer)
+        - everything cropped to roi, the bounding box of all zone drawing
     """
-    # Draw danger zones (filled + outlined)
-    for zone_name, zone_info in DANGER_ZONES.items():
+    fill_image = np.zeros(shape, dtype=np.uint8)
+    line_image = np.zeros(shape, dtype=np.uint8)
+
+    for zone_info in DANGER_ZONES[SAFE + 1:]:
         coords = zone_info["coords"]
         color = zone_info["color"]
         name = zone_info["name"]
 
-        # Create semi-transparent filled polygon
-        overlay = frame.copy()
-        cv2.fillPoly(overlay, [coords], color)
-        cv2.addWeighted(overlay, 0.2, frame, 0.8, 0, frame)
+        # Semi-transparent filled polygon (blended each frame)
+        cv2.fillPoly(fill_image, [coords], color)
 
-        # Draw border
-        cv2.polylines(frame, [coords], True, color, 2)
-
-        # Draw label at first corner point
+        # Border + label at first corner point (drawn opaque)
+        cv2.polylines(line_image, [coords], True, color, 2)
         top_left = tuple(coords[0].astype(int))
         cv2.putText(
-            frame,
+            line_image,
             name,
             top_left,
             cv2.FONT_HERSHEY_SIMPLEX,
@@ -82,32 +108,104 @@ def draw_danger_zones(frame):
             2
         )
 
+    # Crop to the bounding box of everything drawn (fills, borders, labels)
+    drawn = (fill_image | line_image).any(axis=2)
+    rows = np.flatnonzero(drawn.any(axis=1))
+    cols = np.flatnonzero(drawn.any(axis=0))
+    if len(rows) == 0:
+        roi = (slice(0, 0), slice(0, 0))
+    else:
+        roi = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+
+    fill_image = fill_image[roi].copy()
+    line_image = line_image[roi].copy()
+    fill_mask = fill_image.any(axis=2, keepdims=True)
+    line_mask = line_image.any(axis=2, keepdims=True)
+
+    # Reused every frame as the addWeighted output (no per-frame allocation)
+    blend_buffer = np.empty_like(fill_image)
+
+    return roi, fill_image, fill_mask, line_image, line_mask, blend_buffer
+
+def draw_danger_zones(frame):
+    """
+    Draw all danger zones on the frame (visual feedback)
+
+    Args:
+        frame: video frame (numpy array)
+
+    Returns:
+        frame with zones drawn
+    """
+    if frame.shape not in _zone_overlay_cache:
+        _zone_overlay_cache[frame.shape] = build_zone_overlay(frame.shape)
+
+    (roi, fill_image, fill_mask,
+     line_image, line_mask, blend_buffer) = _zone_overlay_cache[frame.shape]
+    frame_roi = frame[roi]
+
+    # 20% zone color inside the polygons, untouched elsewhere
+    cv2.addWeighted(fill_image, 0.2, frame_roi, 0.8, 0, dst=blend_buffer)
+    np.copyto(frame_roi, blend_buffer, where=fill_mask)
+
+    # Opaque borders and labels
+    np.copyto(frame_roi, line_image, where=line_mask)
+
     return frame
 
-def is_person_in_danger_zone(cx, cy):
+def people_in_zones(centers):
     """
-    Check if person (at center point cx, cy) is in any danger zone
+    Check all person centers against all danger zones in one go
 
     Args:
-        cx: center x coordinate
-        cy: center y coordinate
+        centers: (N, 2) array of (cx, cy) points
 
     Returns:
-        (in_danger: bool, zone_name: str, risk_value: int)
+        (N, N_zones) boolean mask, column i = zone id i + 1
+    """
+    centers = np.asarray(centers, dtype=np.float32).reshape(-1, 2)
+
+    if len(centers) == 0:
+        return np.zeros((0, len(ZONE_PATHS)), dtype=bool)
+
+    # Points on the border count as inside (like cv2.pointPolygonTest >= 0).
+    # The radius grows or shrinks the polygon depending on its winding
+    # order, so test both signs and keep the union (= the grown polygon).
+    # Half a pixel: integer centers on the border are caught, neighbours are not.
+    edge = 0.5
+    return np.stack(
+        [path.contains_points(centers, radius=edge) |
+         path.contains_points(centers, radius=-edge)
+         for path in ZONE_PATHS],
+        axis=1
+    )
+
+def get_zone_ids(centers):
     """
-    point = (cx, cy)
+    Zone id for every person center (first matching zone wins)
 
-    for zone_name, zone_info in DANGER_ZONES.items():
-        coords = zone_info["coords"]
+    Args:
+        centers: (N, 2) array of (cx, cy) points
 
-        # Check if point is inside polygon
-        # Returns: >0 if inside, 0 if on edge, <0 if outside
-        result = cv2.pointPolygonTest(coords, point, False)
+    Returns:
+        (N,) uint8 array of zone ids (SAFE = 0)
+    """
+    mask = people_in_zones(centers)
+    zone_ids = np.where(mask.any(axis=1), mask.argmax(axis=1) + 1, SAFE)
+    return zone_ids.astype(np.uint8)
 
-        if result >= 0:  # Person is in this danger zone
-            return True, zone_name, zone_info["risk"]
+def is_person_in_danger_zone(cx, cy):
+    """
+    Check if person (at center point cx, cy) is in any danger zone
 
-    return False, "SAFE", 0
+    Args:
+        cx: center x coordinate
+        cy: center y coordinate
+
+    Returns:
+        zone_id: int (SAFE = 0, look up ZONE_NAMES / ZONE_RISKS)
+    """
+    return int(get_zone_ids([(cx, cy)])[0])
 
 def get_zone_info(cx, cy):
     """
@@ -115,12 +213,9 @@ def get_zone_info(cx, cy):
 
     Returns: dictionary with zone details
     """
-    in_danger, zone_name, risk = is_person_in_danger_zone(cx, cy)
+    zone_id = is_person_in_danger_zone(cx, cy)
 
-    if in_danger:
-        info = DANGER_ZONES[zone_name].copy()
-        info["is_safe"] = False
-    else:
-        info = {"is_safe": True, "name": "SAFE AREA", "risk": 0}
+    info = DANGER_ZONES[zone_id].copy()
+    info["is_safe"] = zone_id == SAFE
 
     return info